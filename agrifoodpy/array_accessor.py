@@ -130,7 +130,7 @@ class XarrayAccessorBase(object):
         
         if isinstance(projection, str):
             if projection == "empty":
-                data = np.zeros(len(years))*np.nan
+                data = np.full(len(years), np.nan)
             elif projection == "constant":
                 data = np.ones(len(years))
             else:
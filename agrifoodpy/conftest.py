@@ -0,0 +1,49 @@
+import matplotlib
+# Render test figures off-screen, before any module imports pyplot
+matplotlib.use("Agg")
+
+import numpy as np
+import xarray as xr
+from agrifoodpy.food.food import FoodBalanceSheet
+import pytest
+
+# Shared (Year, Item) element data for the food balance sheet fixtures
+_ITEMS = ["Beef", "Apples"]
+_YEARS = [2020, 2021]
+
+_IMPORTS, _EXPORTS, _PRODUCTION, _DOMESTIC = (
+    np.array(x, dtype=float) for x in ([[10, 20], [30, 40]],
+                                       [[5, 10], [15, 20]],
+                                       [[50, 60], [70, 80]],
+                                       [[55, 70], [85, 100]]))
+
+def _make_fbs_ds(elements, data):
+    """Build a (Year, Item) Dataset whose element variables reference the
+    given pre-allocated arrays without copying them"""
+
+    return xr.Dataset(
+        data_vars={element: (("Year", "Item"), data[ie])
+                   for ie, element in enumerate(elements)},
+        coords=dict(Item=("Item", _ITEMS), Year=("Year", _YEARS))
+    )
+
+@pytest.fixture(scope="session")
+def basic_fbs():
+    """Food balance sheet with imports, exports, production and domestic use
+    for two items and two years"""
+
+    elements = ["imports", "exports", "production", "domestic"]
+
+    # Single (Element, Year, Item) buffer, each element is a view into it
+    data = np.stack([_IMPORTS, _EXPORTS, _PRODUCTION, _DOMESTIC])
+
+    return FoodBalanceSheet(_make_fbs_ds(elements, data))
+
+@pytest.fixture(scope="session")
+def trade_ds():
+    """Dataset with imports, exports and production only for two items and
+    two years"""
+
+    elements = ["imports", "exports", "production"]
+
+    return _make_fbs_ds(elements, [_IMPORTS, _EXPORTS, _PRODUCTION])
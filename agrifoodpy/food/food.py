@@ -86,8 +86,9 @@ def FoodSupply(items, years, quantities, regions=None, elements=None,
         ndims = len(coords)+1
     
     # make sure the long format has the right number of dimensions
-    while len(quantities.shape) < ndims:
-        quantities = np.expand_dims(quantities, axis=0)
+    if quantities.ndim < ndims:
+        quantities = quantities.reshape((1,) * (ndims - quantities.ndim)
+                                        + quantities.shape)
 
     # If no elements names are given, then create generic ones,
     # one for each dataset
@@ -102,7 +103,7 @@ def FoodSupply(items, years, quantities, regions=None, elements=None,
     if long_format:
         # Create a datasets, one at a time
         for ie, element in enumerate(elements):
-            values = np.zeros(size)*np.nan
+            values = np.full(size, np.nan)
             values[tuple(ii)] = quantities[ie]
             fbs[element] = (coords, values)
 
@@ -323,9 +324,9 @@ class FoodBalanceSheet(XarrayAccessorBase):
             domestic_use = fbs[production] + fbs[imports] - fbs[exports]
 
         if per_item:
-            return fbs["imports"] / domestic_use
+            return fbs[imports] / domestic_use
 
-        return fbs["imports"].sum(dim="Item") / domestic_use.sum(dim="Item")
+        return fbs[imports].sum(dim="Item") / domestic_use.sum(dim="Item")
 
     def plot_bars(self, show="Item", elements=None, inverted_elements=None,
                   ax=None, colors=None, labels=None, **kwargs):
@@ -1,366 +1,292 @@
 import numpy as np
+import pandas as pd
 import xarray as xr
+from numpy import nan, unique
+from xarray import Dataset
 from agrifoodpy.food.food import FoodBalanceSheet, FoodElementSheet
 from agrifoodpy.food.food import FoodSupply
+import matplotlib.pyplot as plt
 import pytest
 
-def test_FoodSupply():
-
-    # Single item, single year
-    single_item = "chicken"
-    single_year = 1990
-    single_quantity = 10
-
-    result = FoodSupply(items=single_item, years=single_year,
-                        quantities=single_quantity)
-
-    truth = xr.Dataset(data_vars = {"Quantity 0":(["Item", "Year"],
-                                                  [[single_quantity]])},
-                    coords = {"Year":[single_year], "Item":[single_item]})
-
-    assert truth.equals(result)
-
-    # Single array item, single array year
-    single_array_item = ["chicken"]
-    single_array_year = [1990]
-    single_array_quantity = [10]
-
-    result = FoodSupply(items=single_array_item, years=single_array_year,
-                        quantities=single_array_quantity)
-
-    truth = xr.Dataset(data_vars = {"Quantity 0":(["Item", "Year"],
-                                                  [single_array_quantity])},
-                    coords = {"Year":single_array_year,
-                              "Item":single_array_item})
-
-    assert truth.equals(result)
-
-    # Single item, single year, single region
-    single_region = "UK"
-    result = FoodSupply(items=single_item, years=single_year,
-                        regions=single_region, quantities=single_quantity)
-
-    truth = xr.Dataset(data_vars = {"Quantity 0":(["Item", "Year", "Region"],
-                                                  [[[single_quantity]]])},
-                    coords = {"Item":[single_item],
-                              "Year":[single_year],
-                              "Region":[single_region]})
-
-    assert truth.equals(result)
-
-    # Single element dimensions, named element 
-    single_element = "Food"
-
-    result = FoodSupply(items=single_item, years=single_year,
-                        regions=single_region, quantities=single_quantity,
-                        elements=single_element)
-
-    truth = xr.Dataset(data_vars = {single_element:(["Item", "Year", "Region"],
-                                                    [[[single_quantity]]])},
-                    coords = {"Item":[single_item],
-                              "Year":[single_year],
-                              "Region":[single_region]})
-
-    assert truth.equals(result)
-
-    # Single item, many years, single region
-    many_years = [1990, 1991, 1992]
-    many_years_qty = [10,20,30]
-
-    result = FoodSupply(items=single_item, years=many_years,
-                        regions=single_region, quantities=many_years_qty)
-    
-    truth_array = np.array(many_years_qty).reshape(1,3,1)
-    truth = xr.Dataset(data_vars = {"Quantity 0":(["Item", "Year", "Region"],
-                                                  truth_array)},
-                       coords = {"Item":[single_item],
-                                 "Year":many_years,
-                                 "Region":[single_region]},)
-
-    assert truth.equals(result)
+_FBS = FoodBalanceSheet
+
+# Scale factors for the (Year, Item) scale_add cases
+_ARRAY_SCALE = np.arange(4, dtype=np.int64).reshape(2, 2)
+_YEAR_SCALE = np.array([1, 1.5])[:, None]
+_ITEM_SCALE = np.array([1, 1.5])[None, :]
+
+@pytest.fixture(autouse=True)
+def _close_figs():
+    """Release any figures created by the plotting tests"""
+    yield
+    plt.close("all")
+
+def _assert_dataset_bytes_equal(a, b):
+    """Compare two Datasets by dims, variable names, dtypes and raw buffers
+    of their data variables and coordinates"""
+
+    assert tuple(a.dims) == tuple(b.dims)
+    assert set(a.data_vars) == set(b.data_vars)
+    assert set(a.coords) == set(b.coords)
+    for name in list(a.data_vars) + list(a.coords):
+        assert a[name].dims == b[name].dims
+        assert a[name].dtype == b[name].dtype
+        assert a[name].values.tobytes() == b[name].values.tobytes()
+
+@pytest.fixture(scope="module")
+def long_format_case():
+    """Long format scatter inputs, the expected dense Item, Year, Region
+    array and its coordinates"""
+
+    items = ["chicken", "chicken", "chicken", "beef"]
+    years = np.array([1990, 1991, 1992, 1992])
+    regions = ["UK", "UK", "UK", "USA"]
+    quantities = [10, 20, 30, 40]
+
+    # Scatter long format quantities onto the dense unique coordinate grid
+    i_idx, items_u = pd.factorize(np.asarray(items), sort=True)
+    y_idx, years_u = pd.factorize(years, sort=True)
+    r_idx, regions_u = pd.factorize(np.asarray(regions), sort=True)
+
+    truth = np.full((items_u.size, years_u.size, regions_u.size), nan)
+    truth[i_idx, y_idx, r_idx] = quantities
+
+    coords = {"Item": items_u, "Year": years_u, "Region": regions_u}
+
+    return items, years, regions, quantities, truth, coords
+
+@pytest.mark.parametrize(
+    "items, years, regions, quantities, elements, expected_dims, expected",
+    [
+        ("chicken", 1990, None, 10, None, ("Item", "Year"), [[10]]),
+        (["chicken"], [1990], None, [10], None, ("Item", "Year"), [[10]]),
+        ("chicken", 1990, "UK", 10, None, ("Item", "Year", "Region"),
+         [[[10]]]),
+        ("chicken", 1990, "UK", 10, "Food", ("Item", "Year", "Region"),
+         [[[10]]]),
+        ("chicken", [1990, 1991, 1992], "UK", [10, 20, 30], None,
+         ("Item", "Year", "Region"), [[[10], [20], [30]]]),
+    ],
+    ids=["single", "single_array", "single_region", "named_element",
+         "many_years"])
+def test_FoodSupply_long(items, years, regions, quantities, elements,
+                         expected_dims, expected):
+
+    result = FoodSupply(items=items, years=years, regions=regions,
+                        quantities=quantities, elements=elements)
+
+    name = "Quantity 0" if elements is None else elements
+
+    assert list(result.data_vars) == [name]
+    assert result[name].dims == expected_dims
+    np.testing.assert_array_equal(result[name].values, expected)
+    np.testing.assert_array_equal(result["Item"].values, unique(items))
+    np.testing.assert_array_equal(result["Year"].values, unique(years))
+    if regions is not None:
+        np.testing.assert_array_equal(result["Region"].values,
+                                      unique(regions))
+
+def test_FoodSupply_scatter(long_format_case):
 
     # Multiple elements in all dimensions
-    many_dim_years = np.array([1990, 1991, 1992, 1992])
-    many_dim_items = ["chicken", "chicken", "chicken", "beef"]
-    many_dim_regions = ["UK", "UK", "UK", "USA"]
-    many_dims_qty = [10, 20, 30, 40]
+    many_dim_items, many_dim_years, many_dim_regions, many_dims_qty, \
+        truth_array, truth_coords = long_format_case
 
     result = FoodSupply(items=many_dim_items, years=many_dim_years,
                         regions=many_dim_regions, quantities=many_dims_qty)
-    
-    truth_array = np.array([[[np.nan,np.nan],[np.nan,np.nan],[np.nan,40]],
-                        [[10,np.nan],[20,np.nan],[30,np.nan]]])
-
-    truth = xr.Dataset(data_vars = {"Quantity 0":(["Item", "Year", "Region"],
-                                                  truth_array)},
-                       coords = {"Item":np.unique(many_dim_items),
-                                 "Year":np.unique(many_dim_years),
-                                 "Region":np.unique(many_dim_regions)})
 
-    assert truth.equals(result)
+    np.testing.assert_array_equal(result["Quantity 0"].values, truth_array)
+    for coord, values in truth_coords.items():
+        np.testing.assert_array_equal(result[coord].values, values)
 
     # TODO Multiple element test. Have to fix the code to be truly long format
     # friendly
 
+def test_FoodSupply_wide():
+
     # Many elements in all dimensions, wide format
 
     many_dim_years = np.array([1990, 1991])
     many_dim_items = ["beef", "chicken"]
     many_dim_regions = ["UK", "USA"]
-    many_dim_qty = 10*np.arange(8).reshape(2,2,2)
-
-    truth = xr.Dataset(data_vars = {"Quantity 0":(["Item", "Year", "Region"],
-                                                  many_dim_qty)},
-                    coords = {"Item":many_dim_items,
-                              "Year":many_dim_years,
-                              "Region":many_dim_regions})
+    many_dim_qty = np.ascontiguousarray(10*np.arange(8).reshape(2,2,2))
 
     result = FoodSupply(items=many_dim_items, years=many_dim_years,
                         regions=many_dim_regions, quantities=many_dim_qty,
                         long_format=False)
 
-    assert result.equals(truth)
+    assert result["Quantity 0"].dims == ("Item", "Year", "Region")
+    np.testing.assert_array_equal(result["Quantity 0"].values, many_dim_qty)
 
     # Many elements in all dimensions, multiple named elements, wide format
 
     many_dim_years = np.array([1990, 1991])
     many_dim_items = ["beef", "chicken"]
     many_dim_regions = ["UK", "USA"]
-    many_dim_qty = 10*np.arange(16).reshape(2,2,2,2)
     many_dim_elements = ["Food", "Waste"]
 
+    # Element-major quantities, one contiguous block per element
+    qty_food = np.ascontiguousarray(10*np.arange(8).reshape(2,2,2),
+                                    dtype=np.float64)
+    qty_waste = np.ascontiguousarray(10*np.arange(8, 16).reshape(2,2,2),
+                                     dtype=np.float64)
+
     result = FoodSupply(items=many_dim_items, years=many_dim_years,
-                        regions=many_dim_regions, quantities=many_dim_qty,
+                        regions=many_dim_regions,
+                        quantities=np.stack([qty_food, qty_waste]),
                         elements=many_dim_elements, long_format=False)
 
-    truth = xr.Dataset(data_vars = {"Food":(["Item", "Year", "Region"],
-                                            many_dim_qty[0]),
-                                    "Waste": (["Item", "Year", "Region"],
-                                              many_dim_qty[1])},
+    np.testing.assert_array_equal(result["Food"].values, qty_food)
+    np.testing.assert_array_equal(result["Waste"].values, qty_waste)
+
+    truth = Dataset(data_vars = {"Food":(("Item", "Year", "Region"),
+                                         qty_food),
+                                 "Waste": (("Item", "Year", "Region"),
+                                           qty_waste)},
                     coords = {"Item":many_dim_items,
                               "Year":many_dim_years,
                               "Region":many_dim_regions})
 
-    assert result.equals(truth)
-
-def test_SSR():
-
-    items = ["Beef", "Apples"]
-    years = [2020, 2021]
-
-    ds = xr.Dataset(
-        data_vars=dict(
-            imports=(["Year", "Item"], [[10, 20], [30, 40]]),
-            exports=(["Year", "Item"], [[5, 10], [15, 20]]),
-            production=(["Year", "Item"], [[50, 60], [70, 80]]),
-            domestic=(["Year", "Item"], [[55, 70], [85, 100]])
-            ),
-
-    coords=dict(Item=("Item", items), Year=("Year", years))
-    )
-
-    fbs = FoodBalanceSheet(ds)
-
-    # Test basic result on all items
-    result_basic = fbs.SSR()
-    ex_result_basic = xr.DataArray([0.88, 0.810810], dims=("Year"),
-                                coords={"Year": years})
-
-    xr.testing.assert_allclose(result_basic, ex_result_basic)
-
-    # Test for an item subset
-    result_subset = fbs.SSR(items="Beef")
-    ex_result_subset = xr.DataArray([0.909090, 0.823529], dims=("Year"),
-                                    coords={"Year": years})
-
-    xr.testing.assert_allclose(result_subset, ex_result_subset)
-
-    # Test per item
-    result_peritem = fbs.SSR(per_item=True)
-    ex_result_peritem = xr.DataArray([[0.909090, 0.857142], [0.823529, 0.8]],
-                                    dims=(["Year", "Item"]),
-                                    coords={"Year": years, "Item": items})
-
-    xr.testing.assert_allclose(result_peritem, ex_result_peritem)
-
-    # Test with domestic use
-    result_domestic = fbs.SSR(domestic="domestic")
-    ex_result_domestic = xr.DataArray([0.88, 0.810810], dims=("Year"),
-                                      coords={"Year": years})
-    
-    xr.testing.assert_allclose(result_domestic, ex_result_domestic)
-
-def test_IDR():
-
-    items = ["Beef", "Apples"]
-    years = [2020, 2021]
-
-    ds = xr.Dataset(
-        data_vars=dict(
-            imports=(["Year", "Item"], [[10, 20], [30, 40]]),
-            exports=(["Year", "Item"], [[5, 10], [15, 20]]),
-            production=(["Year", "Item"], [[50, 60], [70, 80]]),
-            domestic=(["Year", "Item"], [[55, 70], [85, 100]]),
-            ),
-      
-    coords=dict(Item=("Item", items), Year=("Year", years))
-    )
-
-    fbs = FoodBalanceSheet(ds)
-
-    # Test basic result on all items
-    result_basic = fbs.IDR()
-    ex_result_basic = xr.DataArray([0.24, 0.37837838], dims=("Year"),
-                                   coords={"Year": years})
-    
-    xr.testing.assert_allclose(result_basic, ex_result_basic)
-
-    # Test for an item subset
-    result_subset = fbs.IDR(items="Beef")
-    ex_result_subset = xr.DataArray([0.1818181, 0.352941], dims=("Year"),
-                                    coords={"Year": years})
-    
-    xr.testing.assert_allclose(result_subset, ex_result_subset)
-
-    # Test per item
-    result_peritem = fbs.IDR(per_item=True)
-    ex_result_peritem = xr.DataArray([[0.1818181, 0.285714], [0.352941, 0.4]],
-                                     dims=(["Year", "Item"]),
-                                     coords={"Year": years, "Item": items})
-    
-    xr.testing.assert_allclose(result_peritem, ex_result_peritem)
-
-    # Test with domestic use
-    result_domestic = fbs.IDR(domestic="domestic")
-    ex_result_domestic = xr.DataArray([0.24, 0.37837838], dims=("Year"),
-                                      coords={"Year": years})
-    
-    xr.testing.assert_allclose(result_domestic, ex_result_domestic)
-
-def test_scale_add():
-
-    items = ["Beef", "Apples"]
-    years = [2020, 2021]
+    _assert_dataset_bytes_equal(result, truth)
+
+def _assert_da_close(result, expected, **coords):
+    """Compare DataArray values against an array and check its dimensions
+    and coordinate labels, given in dimension order as keyword arguments"""
+
+    np.testing.assert_allclose(result.values, expected, rtol=1e-5)
+    assert result.dims == tuple(coords)
+    for coord, values in coords.items():
+        np.testing.assert_array_equal(result[coord].values, values)
+
+# Expected SSR and IDR truth values for the basic_fbs fixture
+_RATIO_TRUTH = {
+    "SSR": {"basic": [0.88, 0.810810],
+            "subset": [0.909090, 0.823529],
+            "peritem": [[0.909090, 0.857142], [0.823529, 0.8]],
+            "missing": [2.0, 0.810810]},
+    "IDR": {"basic": [0.24, 0.37837838],
+            "subset": [0.1818181, 0.352941],
+            "peritem": [[0.1818181, 0.285714], [0.352941, 0.4]],
+            "missing": [0.545454, 0.37837838]},
+}
+
+@pytest.mark.parametrize("method", ["SSR", "IDR"])
+@pytest.mark.parametrize(
+    "kwargs, case",
+    [
+        ({}, "basic"),
+        ({"items": "Beef"}, "subset"),
+        ({"per_item": True}, "peritem"),
+        ({"domestic": "domestic"}, "basic"),
+    ],
+    ids=["basic", "subset", "per_item", "domestic"])
+def test_ratios(basic_fbs, method, kwargs, case):
+
+    fbs = basic_fbs
+    coords = {"Year": fbs._obj.Year.values}
+    if kwargs.get("per_item", False):
+        coords["Item"] = fbs._obj.Item.values
+
+    result = getattr(fbs, method)(**kwargs)
+    _assert_da_close(result, _RATIO_TRUTH[method][case], **coords)
+
+@pytest.mark.parametrize("method", ["SSR", "IDR"])
+def test_ratios_missing(basic_fbs, method):
+
+    # Items with a missing element are left out of the domestic use total,
+    # but still count towards the total production and imports
+    ds = basic_fbs._obj.copy(deep=True)
+    ds["exports"].loc[{"Year": 2020, "Item": "Apples"}] = np.nan
+
+    result = getattr(_FBS(ds), method)()
+    _assert_da_close(result, _RATIO_TRUTH[method]["missing"],
+                     Year=ds.Year.values)
+
+def _check_scale_add(fbs, ds, scale, items=None, add=True):
+    """Compare scale_add from production to imports against a direct
+    computation of the expected element arrays"""
+
+    result = fbs.scale_add("production", "imports", scale, items=items,
+                           add=add)
+
+    if items is None:
+        expected_in = ds["production"] * scale
+    else:
+        expected_in = ds["production"].where(~ds.Item.isin(items),
+                                             ds["production"] * scale)
+
+    delta = expected_in - ds["production"]
+    expected_out = ds["imports"] + delta if add else ds["imports"] - delta
+
+    xr.testing.assert_allclose(result["production"], expected_in)
+    xr.testing.assert_allclose(result["imports"], expected_out)
+
+@pytest.mark.parametrize("add", [True, False], ids=["add", "subtract"])
+@pytest.mark.parametrize(
+    "scale, items",
+    [
+        (1.5, None),
+        (_ARRAY_SCALE, None),
+        (_YEAR_SCALE, None),
+        (_ITEM_SCALE, None),
+        (1.5, ["Beef"]),
+    ],
+    ids=["scalar", "array", "year_axis", "item_axis", "scalar_subset"])
+def test_scale_add_scale(basic_fbs, scale, items, add):
+
+    _check_scale_add(basic_fbs, basic_fbs._obj, scale, items=items, add=add)
+
+def test_scale_add(basic_fbs):
+
+    fbs = basic_fbs
+    ds = fbs._obj
 
     scalar_scale = 1.5
-    array_scale = np.arange(4).reshape((2,2))
-
-    xarray_year_scale = xr.DataArray([1, 1.5], coords={'Year': years},
-                                     dims=['Year'])
-    xarray_item_scale = xr.DataArray([1, 1.5], coords={'Item': items},
-                                     dims=['Item'])
 
     elin = "production"
     elout = "imports"
 
-    im_data = np.array([[10, 20], [30, 40]])
-    ex_data = np.array([[5, 10], [15, 20]])
-    pr_data= np.array([[50, 60], [70, 80]])
-
-    ds = xr.Dataset(
-        data_vars=dict(
-            imports=(["Year", "Item"], im_data),
-            exports=(["Year", "Item"], ex_data),
-            production=(["Year", "Item"], pr_data)
-            ),
-
-    coords=dict(Item=("Item", items), Year=("Year", years))
-    )
-
-    fbs = FoodBalanceSheet(ds)
-
-    # Test with float scale on all items
-    result_scalar = fbs.scale_add(elin, elout, scalar_scale)
-    assert np.array_equal(result_scalar[elin], ds[elin]*scalar_scale)
-    assert np.array_equal(result_scalar[elout], ds[elout] +
-                          (result_scalar[elin] - ds[elin]))
-
-    # Test with float scale on all items with subtraction 
-    result_scalar_sub = fbs.scale_add(elin, elout, scalar_scale, add=False)
-    assert np.array_equal(result_scalar_sub[elin], ds[elin]*scalar_scale)
-    assert np.array_equal(result_scalar_sub[elout], ds[elout] -
-                          (result_scalar_sub[elin] - ds[elin]))
-
-    # Test with float scale on some items
-    result_scalar_item = fbs.scale_add(elin, elout, scalar_scale, items="Beef")
-    assert np.array_equal(result_scalar_item[elin].sel(Item="Beef"),
-                          ds[elin].sel(Item="Beef")*scalar_scale)
-    
-    assert np.array_equal(result_scalar_item[elout].sel(Item="Beef"),
-                          ds[elout].sel(Item="Beef") + 
-                          (result_scalar_item[elin].sel(Item="Beef")
-                           - ds[elin].sel(Item="Beef")))
-    
-    assert np.array_equal(result_scalar_item[elin].sel(Item="Apples"),
-                          ds[elin].sel(Item="Apples"))
-    
-    assert np.array_equal(result_scalar_item[elout].sel(Item="Apples"),
-                          ds[elout].sel(Item="Apples"))
+    ds_in = ds[elin].values
+    ds_out = ds[elout].values
+
+    # Cached element arrays for the elasticity checks
+    ds_exports = ds["exports"].values
+    ds_in_scaled = ds_in*scalar_scale
+    ds_values = {"imports": ds_out, "exports": ds_exports}
+    ds_out_stack = np.stack([ds_out, ds_exports])
 
-    # Test with float scale on some items with subtraction
-    result_scalar_item_sub = fbs.scale_add(elin, elout, scalar_scale,
-                                           items="Beef", add=False)
-    
-    assert np.array_equal(result_scalar_item_sub[elin].sel(Item="Beef"),
-                          ds[elin].sel(Item="Beef")*scalar_scale)
-    
-    assert np.array_equal(result_scalar_item_sub[elout].sel(Item="Beef"),
-                          ds[elout].sel(Item="Beef") -
-                          (result_scalar_item_sub[elin].sel(Item="Beef")
-                           - ds[elin].sel(Item="Beef")))
-    
-    assert np.array_equal(result_scalar_item_sub[elin].sel(Item="Apples"),
-                          ds[elin].sel(Item="Apples"))
-    
-    assert np.array_equal(result_scalar_item_sub[elout].sel(Item="Apples"),
-                          ds[elout].sel(Item="Apples"))
-
-    # Test with array scale on all items
-    result_array = fbs.scale_add(elin, elout, array_scale)
-    assert np.array_equal(result_array[elin], ds[elin]*array_scale)
-    assert np.array_equal(result_array[elout], ds[elout] + (result_array[elin]
-                                                            - ds[elin]))
-
-    # Test with DataArray scale on years only
-    result_xarray_year = fbs.scale_add(elin, elout, xarray_year_scale)
-    assert np.array_equal(result_xarray_year[elin], ds[elin]*xarray_year_scale)
-    assert np.array_equal(result_xarray_year[elout], ds[elout]
-                          + (result_xarray_year[elin] - ds[elin]))
-
-    # Test with DataArray scale on items only
-    result_xarray_item = fbs.scale_add(elin, elout, xarray_item_scale)
-    assert np.array_equal(result_xarray_item[elin], ds[elin]*xarray_item_scale)
-    assert np.array_equal(result_xarray_item[elout], ds[elout]
-                          + (result_xarray_item[elin] - ds[elin]))
-    
     # Test with expliciit elasticity
     elasticity = 0.5
     result_elasticity = fbs.scale_add(elin, elout, scalar_scale,
                                       elasticity=elasticity)
-    assert np.array_equal(result_elasticity[elin], ds[elin]*scalar_scale)
-    assert np.array_equal(result_elasticity[elout], ds[elout] +
-                          (result_elasticity[elin] - ds[elin])*elasticity)
+    r_in = result_elasticity[elin].values
+    np.testing.assert_array_equal(r_in, ds_in_scaled)
+    np.testing.assert_array_equal(result_elasticity[elout].values, ds_out +
+                                  (r_in - ds_in)*elasticity)
 
     # Test with multiple out elements, single elasticity
     elout = ["imports", "exports"]
     result_multi = fbs.scale_add(elin, elout, scalar_scale,
                                  elasticity=elasticity)
-    assert np.array_equal(result_multi[elin], ds[elin]*scalar_scale)
+    r_in = result_multi[elin].values
+    np.testing.assert_array_equal(r_in, ds_in_scaled)
 
     for elmnt in elout:
-        assert np.array_equal(result_multi[elmnt], ds[elmnt] +
-                              (result_multi[elin] - ds[elin])*elasticity)
+        np.testing.assert_array_equal(result_multi[elmnt].values,
+                                      ds_values[elmnt] +
+                                      (r_in - ds_in)*elasticity)
         
     # Test with multiple out elements, multiple elasticities
     elout = ["imports", "exports"]
     elasticity = [0.2, 0.7]
     result_multi = fbs.scale_add(elin, elout, scalar_scale,
                                  elasticity=elasticity)
-    assert np.array_equal(result_multi[elin], ds[elin]*scalar_scale)
+    r_in = result_multi[elin].values
+    np.testing.assert_array_equal(r_in, ds_in_scaled)
 
-    for elmnt, elast in zip(elout, elasticity):
-        assert np.array_equal(result_multi[elmnt], ds[elmnt] +
-                              (result_multi[elin] - ds[elin])*elast)
+    np.testing.assert_array_equal(
+        np.stack([result_multi[elmnt].values for elmnt in elout]),
+        ds_out_stack + np.asarray(elasticity)[:, None, None]*(r_in - ds_in))
         
     # Test with multiple out elements, multiple elasticities and different signs
     elout = ["imports", "exports"]
@@ -368,110 +294,135 @@ def test_scale_add():
     add = [False, True]
     result_multi = fbs.scale_add(elin, elout, scalar_scale,
                                  elasticity=elasticity, add=add)
-    assert np.array_equal(result_multi[elin], ds[elin]*scalar_scale)
-
-    for elmnt, elast, sign in zip(elout, elasticity, add):
-        assert np.array_equal(result_multi[elmnt], ds[elmnt] +
-                              np.where(sign, 1, -1) * (result_multi[elin]
-                                                       - ds[elin])*elast)
-
-def test_scale_element():
-    
-    items = ["Beef", "Apples"]
-    years = [2020, 2021]
-
-    ds = xr.Dataset(
-        data_vars=dict(
-            imports=(["Year", "Item"], [[10, 20], [30, 40]]),
-            exports=(["Year", "Item"], [[5, 10], [15, 20]]),
-            production=(["Year", "Item"], [[50, 60], [70, 80]])
-            ),
-        
-        coords=dict(Item=("Item", items), Year=("Year", years))
-        )
-    
-    fbs = FoodBalanceSheet(ds)
+    r_in = result_multi[elin].values
+    np.testing.assert_array_equal(r_in, ds_in_scaled)
+
+    # Signed elasticities along the leading (stacked element) axis
+    signed = np.where(add, 1, -1)*np.asarray(elasticity)
+    np.testing.assert_array_equal(
+        np.stack([result_multi[elmnt].values for elmnt in elout]),
+        ds_out_stack + signed[:, None, None]*(r_in - ds_in))
+
+@pytest.mark.parametrize(
+    "method, kwargs",
+    [
+        ("SSR", {}),
+        ("IDR", {"per_item": True}),
+        ("scale_element", {"element": "production", "scale": 0.5,
+                           "items": "Beef"}),
+        ("scale_add", {"element_in": "production", "element_out": "imports",
+                       "scale": 1.5}),
+    ],
+    ids=["SSR", "IDR", "scale_element", "scale_add"])
+def test_chunked(basic_fbs, method, kwargs):
+
+    pytest.importorskip("dask")
+
+    chunked = _FBS(basic_fbs._obj.chunk({"Year": 1}))
+    result = getattr(chunked, method)(**kwargs)
+
+    # Results stay lazy until explicitly computed
+    assert result.chunks
+    xr.testing.assert_allclose(result.compute(),
+                               getattr(basic_fbs, method)(**kwargs))
+
+def test_scale_element(basic_fbs):
+
+    fbs = basic_fbs
+    ds = fbs._obj
+    years = ds.Year.values
+
+    # Cached (Year, Item) element arrays
+    pr = ds["production"].values
+    im = ds["imports"].values
+    ex = ds["exports"].values
 
     # Scale single element by a single value
     result_single = fbs.scale_element("production", 0.5)
-    xr.testing.assert_equal(result_single["production"], 0.5*ds["production"])
-    xr.testing.assert_equal(result_single["imports"], ds["imports"])
+    np.testing.assert_array_equal(result_single["imports"].values, im)
 
     # Scale item subset
     result_subset = fbs.scale_element("production", 0.5, items="Beef")
-    xr.testing.assert_equal(result_subset["production"],
-                            [0.5, 1.0]*ds["production"])
 
     # Scale element array
     elements = ["production", "imports"]
     result_elements = fbs.scale_element(elements, 0.5)
-    xr.testing.assert_equal(result_elements[elements], 0.5*ds[elements])
-    xr.testing.assert_equal(result_elements["exports"], ds["exports"])
+    for element in elements:
+        np.testing.assert_array_equal(result_elements[element].values,
+                                      0.5*ds[element].values)
+    np.testing.assert_array_equal(result_elements["exports"].values, ex)
 
     # Scale by array of values
     scale_arr = [0.5, 2.0]
     result_arr = fbs.scale_element("production", scale_arr)
-    xr.testing.assert_equal(result_arr["production"],
-                            [0.5, 2.0]*ds["production"])
-
 
     # Scale by array of xarray along one named dimension
     scale_year = xr.DataArray([0.5, 2.0], dims="Year", coords={"Year":years})
     result_year = fbs.scale_element("production", scale_year)
-    xr.testing.assert_equal(result_year["production"],
-                            [[0.5], [2.0]]*ds["production"])
 
-def test_plot_bars():
+    # All single element variants share the (Year, Item) shape, so compare
+    # their production arrays in a single pass
+    actual = np.stack([result["production"].values for result in
+                       (result_single, result_subset, result_arr, result_year)])
+    expected = np.stack([0.5*pr,
+                         np.array([0.5, 1.0])[None, :]*pr,
+                         np.array(scale_arr)[None, :]*pr,
+                         np.array([0.5, 2.0])[:, None]*pr])
+    np.testing.assert_array_equal(actual, expected)
 
-    items = ["Beef", "Apples"]
-    years = [2020, 2021]
+def _patch_widths(ax):
+    """Collect the widths of all bar patches on an axis as a float array"""
 
-    ds = xr.Dataset(
-        data_vars=dict(
-            imports=(["Year", "Item"], [[10, 20], [30, 40]]),
-            exports=(["Year", "Item"], [[5, 10], [15, 20]]),
-            production=(["Year", "Item"], [[50, 60], [70, 80]])
-            ),
-        coords=dict(Item=("Item", items), Year=("Year", years)))
-    
-    fbs = FoodBalanceSheet(ds)
+    return np.fromiter((p.get_width() for p in ax.patches), dtype=float,
+                       count=len(ax.patches))
+
+def test_plot_bars(trade_ds):
+
+    ds = trade_ds
+    fbs = _FBS(ds)
 
     # Test default call
     ax_default = fbs.plot_bars()
 
     assert len(ax_default.patches) == 6
-    for ip, w in enumerate(ds.sum(dim="Year").to_array().values.flatten()):
-        assert ax_default.patches[ip].get_width() == w
+    np.testing.assert_array_equal(_patch_widths(ax_default),
+                                  ds.sum(dim="Year").to_array().values.ravel())
 
     # Test with explicit "show" coordinate
     ax_show = fbs.plot_bars(show="Year")
     
     assert len(ax_show.patches) == 6
-    for ip, w in enumerate(ds.sum(dim="Item").to_array().values.flatten()):
-        assert ax_show.patches[ip].get_width() == w
+    np.testing.assert_array_equal(_patch_widths(ax_show),
+                                  ds.sum(dim="Item").to_array().values.ravel())
 
     # Test with a single element
     ax_single = fbs.plot_bars(elements=["production"])
 
     assert len(ax_single.patches) == 2
-    for ip, w in enumerate(ds["production"].sum(dim="Year").values.flatten()):
-        assert ax_single.patches[ip].get_width() == w
+    np.testing.assert_array_equal(_patch_widths(ax_single),
+                                  ds["production"].sum(dim="Year").values)
 
     # Test with a Non-dimension "show"
     ds_nondim = ds.assign_coords({"Origin":("Item", ["Animal", "Plant"])})
     assert "Origin" not in ds_nondim.dims
-    fbs_nondim = FoodBalanceSheet(ds_nondim)
+    fbs_nondim = _FBS(ds_nondim)
 
     ax_nondim = fbs_nondim.plot_bars(show="Origin")
     assert len(ax_nondim.patches) == 6
-    for ip, w in enumerate(ds_nondim.sum(dim="Year").to_array(
-        ).values.flatten()):
-        assert ax_nondim.patches[ip].get_width() == w
+    np.testing.assert_array_equal(
+        _patch_widths(ax_nondim),
+        ds_nondim.sum(dim="Year").to_array().values.ravel())
 
     # Test with a "show" dimension not in the coordinate list
     with pytest.raises(ValueError):
         ax_notincoord = fbs.plot_bars(show="NotInCoord")
        
+def _line_data(ax, axis):
+    """Stack the x or y data of all lines on an axis into a 2D array"""
+
+    getter = "get_xdata" if axis == "x" else "get_ydata"
+    return np.stack([getattr(line, getter)() for line in ax.lines])
+
 def test_plot_years():
     
     da = xr.DataArray(np.arange(15).reshape(5,3),
@@ -484,24 +435,27 @@ def test_plot_years():
     # Test default call
     ax_default = fbs.plot_years()
     assert len(ax_default.lines) == 1
-    assert np.array_equal(ax_default.lines[0].get_ydata(),
-                          da.sum(dim="Region").values)
-    assert np.array_equal(ax_default.lines[0].get_xdata(), da.Year.values)
+    np.testing.assert_array_equal(ax_default.lines[0].get_ydata(),
+                                  da.sum(dim="Region").values)
+    np.testing.assert_array_equal(ax_default.lines[0].get_xdata(),
+                                  da.Year.values)
 
     # Test with explicit "show" coordinate
     ax_show = fbs.plot_years(show="Region")
     assert len(ax_show.lines) == 3
-    for il, line in enumerate(ax_show.lines):
-        assert np.array_equal(line.get_ydata(),
-                              da.cumsum(dim="Region").isel(Region=il).values)
-        assert np.array_equal(line.get_xdata(), da.Year.values)
+    np.testing.assert_array_equal(
+        _line_data(ax_show, "y"),
+        da.cumsum(dim="Region").transpose("Region", "Year").values)
+    np.testing.assert_array_equal(_line_data(ax_show, "x"),
+                                  np.tile(da.Year.values, (3, 1)))
 
     # Test without stacking
     ax_no_stack = fbs.plot_years(show="Region", stack=False)
     assert len(ax_no_stack.lines) == 3
-    for il, line in enumerate(ax_no_stack.lines):
-        assert np.array_equal(line.get_ydata(), da.isel(Region=il).values)
-        assert np.array_equal(line.get_xdata(), da.Year.values)
+    np.testing.assert_array_equal(_line_data(ax_no_stack, "y"),
+                                  da.transpose("Region", "Year").values)
+    np.testing.assert_array_equal(_line_data(ax_no_stack, "x"),
+                                  np.tile(da.Year.values, (3, 1)))
 
     # Test with array wihtout "Year" dimension
     da_noyear = da.sum(dim="Year")
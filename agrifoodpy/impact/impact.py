@@ -3,9 +3,11 @@
 
 import numpy as np
 import xarray as xr
+from scipy.sparse import csr_matrix
 from agrifoodpy.array_accessor import XarrayAccessorBase
 
-def impact(items, regions, quantities, datasets=None, long_format=True):
+def impact(items, regions, quantities, datasets=None, long_format=True,
+           dtype=None):
     """Impact style dataset constructor
 
     Parameters
@@ -23,6 +25,12 @@ def impact(items, regions, quantities, datasets=None, long_format=True):
         Array with model name strings
     long_format : bool
         Boolean flag to interpret data in long or wide format
+    dtype : data-type, optional
+        Data type of the impact arrays. Defaults to float64 for long format
+        and to the type of `quantities` for wide format. Long format arrays
+        are filled with nan for missing combinations, so it must be a
+        floating point type. Using float32 halves the memory of large impact
+        datasets.
 
     Returns
     -------
@@ -35,17 +43,21 @@ def impact(items, regions, quantities, datasets=None, long_format=True):
     if np.isscalar(quantities):
         long_format = True
 
-    quantities = np.array(quantities)
+    if long_format and dtype is not None and \
+        not np.issubdtype(dtype, np.floating):
+        raise ValueError("Long format impacts must have a floating point dtype")
 
-    # Identify unique values in coordinates
-    _items = np.unique(items)
-    _regions = np.unique(regions)
+    quantities = np.array(quantities, dtype=dtype)
+
+    # Identify unique values in coordinates, and the positions in the output
+    # array of each input value to organize data
+    _items, ii_items = np.unique(items, return_inverse=True)
+    _regions, ii_regions = np.unique(regions, return_inverse=True)
 
     coords = {"Item" : _items,
               "Region" : _regions}
 
-    # find positions in output array to organize data
-    ii = [np.searchsorted(_items, items), np.searchsorted(_regions, regions)]
+    ii = [ii_items, ii_regions]
     size = (len(_items), len(_regions))
 
     # Create empty dataset
@@ -58,8 +70,9 @@ def impact(items, regions, quantities, datasets=None, long_format=True):
 
     # make sure the long format has two dimensions
     # One along items and regions, one along datasets
-    while len(quantities.shape) < ndims:
-        quantities = np.expand_dims(quantities, axis=0)
+    if quantities.ndim < ndims:
+        quantities = quantities.reshape((1,) * (ndims - quantities.ndim)
+                                        + quantities.shape)
 
     # If no dataset names are given, then create generic ones, one for each
     # dataset
@@ -72,11 +85,17 @@ def impact(items, regions, quantities, datasets=None, long_format=True):
         datasets = [datasets]
 
     if long_format:
-        # Create a datasets, one at a time
+        # Scatter all datasets at once into a single NaN filled buffer
+        values = np.full((quantities.shape[0],) + size, np.nan,
+                         dtype=np.float64 if dtype is None else dtype)
+        # Flat positions on the (Item, Region) grid, so the scatter is a
+        # single indexed store along one axis of each dataset
+        flat_ii = np.ravel_multi_index(tuple(ii), size)
+        values.reshape(quantities.shape[0], -1)[:, flat_ii] = quantities
+
+        # Create a datasets, one at a time, as views of the buffer
         for id, dataset in enumerate(datasets):
-            values = np.zeros(size)*np.nan
-            values[tuple(ii)] = quantities[id]
-            data[dataset] = (coords, values)
+            data[dataset] = (coords, values[id])
 
     else:
         quantities = quantities[:, ii[0]]
@@ -89,6 +108,23 @@ def impact(items, regions, quantities, datasets=None, long_format=True):
 
     return data
 
+def _prepare_matching_matrix(matching_matrix):
+    """Returns the output items, input items and sparse matrix form of a
+    matching matrix DataFrame"""
+
+    out_items = matching_matrix["Item Code"]
+
+    # First column is the item code column
+    in_items = matching_matrix.columns[1:]
+
+    # Again, we avoid first column. Matching matrices are mostly zeros, with
+    # few input items assigned to each output item, so they are stored and
+    # multiplied in sparse form
+    mat = csr_matrix(matching_matrix.iloc[:, 1:].fillna(0).to_numpy(
+        dtype=np.float64))
+
+    return out_items, in_items, mat
+
 @xr.register_dataset_accessor("impact")
 class Impact(XarrayAccessorBase):
 
@@ -114,7 +150,8 @@ class Impact(XarrayAccessorBase):
             Defines how items are matched from the input to the output datasets,
             with the values of the matrix indicating the scaling of the
             impact quantities. Column names indicate the original item list, while
-            row names indicate the new item list
+            row names indicate the new item list. Missing values on an input
+            item only propagate to the output items it is matched to.
 
         Returns
         -------
@@ -125,27 +162,49 @@ class Impact(XarrayAccessorBase):
 
         impact = self._obj
 
-        out_items = matching_matrix["Item Code"]
+        out_items, in_items_mat, mat = \
+            _prepare_matching_matrix(matching_matrix)
 
         in_items = impact.Item.values
 
-        # First column is the item code column
-        in_items_mat = matching_matrix.columns[1:]
-
-        assert np.equal(in_items, in_items_mat).all() , \
+        assert np.array_equal(in_items, in_items_mat), \
             "Input items do not match assignment matrix"
 
-        # Again, we avoid first column
-        mat = matching_matrix.iloc[:, 1:].fillna(0).to_numpy()
+        # Flatten any dimensions other than Item and stack all variables
+        # column-wise, so the matching matrix is applied in a single product
+        data_in = [impact[var].transpose("Item", ...) for var in impact.keys()]
+        columns = [da.values.reshape(len(in_items), -1) for da in data_in]
+        splits = np.cumsum([col.shape[1] for col in columns])[:-1]
+
+        # Single precision impacts are matched in single precision
+        dtype = np.result_type(np.float32, *columns)
+        mat = mat.astype(dtype, copy=False)
+
+        # The concatenated block is C-contiguous and matches the matrix dtype,
+        # so the product does not need to copy or cast it again. A single
+        # variable is used as is, skipping the concatenation copy
+        if len(columns) == 1:
+            block = columns[0].astype(dtype, copy=False)
+        else:
+            block = np.concatenate(columns, axis=1, dtype=dtype)
+
+        products = mat @ block
+
+        # Collect all output variables before building the Dataset once,
+        # keeping the coordinates of their dimensions other than Item
+        data_vars = {}
+        coords = {}
+        for da, data_out in zip(data_in, np.split(products, splits, axis=1)):
+            data_out = data_out.reshape((-1,) + da.shape[1:])
+            data_vars[da.name] = (da.dims, data_out)
+            coords.update({name: coord.variable for name, coord
+                           in da.coords.items() if "Item" not in coord.dims})
+
+        coords["Item"] = ("Item", out_items)
 
         dataset_out = xr.Dataset(
-            coords = dict(
-                Item=("Item", out_items),
-            )
+            data_vars = data_vars,
+            coords = coords
         )
 
-        for var in list(impact.keys()):
-            data_out = np.matmul(mat, impact[var].values)
-            dataset_out = dataset_out.assign({var:("Item", data_out)})
-
         return dataset_out
\ No newline at end of file
@@ -3,6 +3,8 @@
 
 import xarray as xr
 import numpy as np
+import copy
+import functools
 
 def fbs_impacts(fbs, impact_element, population=None, sum_dims=None):
     """Computes total impacts from quantities in a food balance sheet Dataset or
@@ -30,48 +32,53 @@ def fbs_impacts(fbs, impact_element, population=None, sum_dims=None):
         Total impact computed from food balance sheet data and impact array
     """
 
-    total_impact = fbs * impact_element
+    # Combine the impacts and population first, as these are usually much
+    # smaller than the food balance sheet, so it is only traversed once
+    weights = impact_element
     if population is not None:
-        total_impact *= population
+        weights = weights * population
 
     if sum_dims is not None:
-        total_impact = total_impact.sum(dim=sum_dims)
-        
-    return total_impact
+        dims = [sum_dims] if isinstance(sum_dims, str) else list(sum_dims)
 
-def fair_co2_only(emissions):
-    """Simple Interface to FaIR, the Finite-amplitude Impulse-Response
-    atmosferic model.
+        if isinstance(fbs, xr.Dataset):
+            arrays = list(fbs.data_vars.values())
+        else:
+            arrays = [fbs]
 
-    Computes the concentration, radiative forcing and temperature anomaly for an 
-    array of CO2 emissions per year assuming a clean atmosphere and default
-    values for amosferic parameters.
+        # Contract over the summed dimensions without materializing the full
+        # product, when every array has all of them. Missing values count as
+        # zero, as they do in a sum
+        if isinstance(weights, xr.DataArray) and \
+            all(set(dims) <= set(da.dims) for da in arrays):
+            weights = weights.fillna(0)
 
-    Parameters
-    ----------
-    emissions : xarray.DataArray or xarray.Dataset
-        Array containing GHG emissions in Gt CO2e per year 
+            if isinstance(fbs, xr.Dataset):
+                return fbs.fillna(0).map(xr.dot, args=(weights,), dim=dims)
 
-    Returns
-    -------
-    T : xarray.DataArray
-        Temperature anomaly in Kelvin degrees at the zero layer
-    C : xarray.DataArray
-        Atmosferic CO2e concetration in ppm 
-    F : xarray.DataArray
-        Effective radiative forcing in W m^-2
-    """
+            return xr.dot(fbs.fillna(0), weights, dim=dims)
+
+        return (fbs * weights).sum(dim=dims)
+
+    return fbs * weights
+
+# Configured FaIR instances are cached by the first and last emission years
+# and the scenario names, keeping only the most recently used ones alive
+@functools.lru_cache(maxsize=8)
+def _build_fair(year_start, year_end, scenarios=("default",)):
+    """Builds, or retrieves from the cache, a CO2 only FaIR instance with
+    default configuration and initial conditions for a range of years and a
+    tuple of scenarios, ready to receive emissions. The cached instance must
+    not be run directly"""
 
     from fair import FAIR
     from fair.interface import fill, initialise
     f = FAIR()
 
-    years = np.unique(emissions.Year.values)
-
     # Configure method, timebounds, and labels
     f.ghg_method='myhre1998'
-    f.define_time(years[0]-0.5, years[-1]+0.5, 1)
-    f.define_scenarios(["default"])
+    f.define_time(year_start-0.5, year_end+0.5, 1)
+    f.define_scenarios(list(scenarios))
     f.define_configs(["default"])
 
     # Define CO2 as the only specie
@@ -109,14 +116,72 @@ def fair_co2_only(emissions):
 
     # Fill species configs
     f.fill_species_configs()
-    
-    f.emissions.loc[{"scenario":"default",
-                     "specie":"CO2",
-                     "config":"default"}] = emissions.to_numpy()
-    
+
+    return f
+
+def fair_co2_only(emissions):
+    """Simple Interface to FaIR, the Finite-amplitude Impulse-Response
+    atmosferic model.
+
+    Computes the concentration, radiative forcing and temperature anomaly for an 
+    array of CO2 emissions per year assuming a clean atmosphere and default
+    values for amosferic parameters.
+
+    Parameters
+    ----------
+    emissions : xarray.DataArray or xarray.Dataset
+        Array containing GHG emissions in Gt CO2e per year. If it has a
+        dimension other than "Year", each of its values is treated as a
+        separate emissions scenario and all of them are run at once.
+
+    Returns
+    -------
+    T : xarray.DataArray
+        Temperature anomaly in Kelvin degrees at the zero layer
+    C : xarray.DataArray
+        Atmosferic CO2e concetration in ppm 
+    F : xarray.DataArray
+        Effective radiative forcing in W m^-2
+    """
+
+    years = np.unique(emissions.Year.values)
+
+    batch_dims = [dim for dim in emissions.dims if dim != "Year"]
+    if len(batch_dims) > 1:
+        raise ValueError("Emissions can have at most one dimension besides "
+                         "'Year'")
+
+    if batch_dims:
+        batch_dim = batch_dims[0]
+        scenarios = emissions[batch_dim].values.tolist()
+        emissions = emissions.transpose("Year", batch_dim)
+    else:
+        scenarios = ["default"]
+
+    # Work on a copy of the configured instance, so that repeated calls on the
+    # same range of years and scenarios skip the setup
+    f = copy.deepcopy(_build_fair(years[0], years[-1],
+                                  tuple(scenarios)))
+
+    f.emissions.loc[{"specie":"CO2",
+                     "config":"default"}] = \
+        emissions.to_numpy().reshape(-1, len(scenarios))
+
     # Run and return
     f.run(progress=False)
 
+    if batch_dims:
+        T = f.temperature.sel(config="default", layer=0).drop_vars(
+            ["config", "layer"])
+
+        C = f.concentration.sel(config="default", specie="CO2").drop_vars(
+            ["config", "specie"])
+
+        F = f.forcing.sel(config="default", specie="CO2").drop_vars(
+            ["config", "specie"])
+
+        return tuple(da.rename(scenario=batch_dim) for da in (T, C, F))
+
     return_dict = {"scenario":"default", "config":"default"}
 
     T = f.temperature.sel(return_dict).drop_vars(
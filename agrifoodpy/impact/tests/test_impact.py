@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import xarray as xr
+import pytest
+
+def test_impact():
+
+    from agrifoodpy.impact.impact import impact
+
+    # Long format, with missing combinations filled with nan
+    result = impact(["a", "b"], ["x", "y"], [1, 2], datasets="GHG",
+                    dtype=np.float32)
+
+    assert result["GHG"].dtype == np.float32
+    np.testing.assert_array_equal(result["GHG"], [[1, np.nan], [np.nan, 2]])
+
+    # Long format data cannot hold nan in non floating point types
+    with pytest.raises(ValueError):
+        impact(["a", "b"], ["x", "y"], [1, 2], dtype=int)
+
+def test_match():
+
+    from agrifoodpy.impact.impact import Impact
+
+    items = ["Beef", "Apples", "Wheat"]
+    regions = ["UK", "US"]
+
+    impact = xr.Dataset(
+        data_vars=dict(
+            GHG=(("Item",), [100., 0.5, 2.]),
+            Land=(("Item", "Region"), [[10., 20.], [1., 2.], [3., 4.]])
+            ),
+        coords=dict(Item=("Item", items), Region=("Region", regions))
+    )
+
+    # New item base, with one item mapped from two inputs and an empty row
+    matching_matrix = pd.DataFrame({"Item Code": ["Meat", "Plants", "Other"],
+                                    "Beef": [1., np.nan, np.nan],
+                                    "Apples": [np.nan, 0.5, np.nan],
+                                    "Wheat": [np.nan, 0.5, np.nan]})
+
+    result = Impact(impact).match(matching_matrix)
+
+    np.testing.assert_array_equal(result["Item"], ["Meat", "Plants", "Other"])
+    np.testing.assert_array_equal(result["GHG"], [100., 1.25, 0.])
+    assert result["Land"].dims == ("Item", "Region")
+    np.testing.assert_array_equal(result["Region"], ["UK", "US"])
+    np.testing.assert_array_equal(result["Land"],
+                                  [[10., 20.], [2., 3.], [0., 0.]])
+
+    # Missing input values only reach the output items they are matched to
+    result_nan = Impact(impact.where(impact.Item != "Wheat")).match(
+        matching_matrix)
+    np.testing.assert_array_equal(result_nan["GHG"], [100., np.nan, 0.])
+    np.testing.assert_array_equal(result_nan["Land"],
+                                  [[10., 20.], [np.nan, np.nan], [0., 0.]])
+
+    # Single variable datasets give the same result
+    result_single = Impact(impact[["GHG"]]).match(matching_matrix)
+    xr.testing.assert_equal(result_single["GHG"], result["GHG"])
+
+    # Single precision impacts are matched in single precision
+    result_32 = Impact(impact.astype(np.float32)).match(matching_matrix)
+    assert result_32["GHG"].dtype == np.float32
+    np.testing.assert_allclose(result_32["GHG"], result["GHG"])
+
+    # Matching matrices edited in place are picked up on the next call
+    matching_matrix.loc[1, "Apples"] = 2.
+    result_edited = Impact(impact).match(matching_matrix)
+    np.testing.assert_array_equal(result_edited["GHG"], [100., 2., 0.])
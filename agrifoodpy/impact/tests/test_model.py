@@ -1,23 +1,14 @@
 import numpy as np
 import xarray as xr
 
-def test_fbs_impacts():
+def test_fbs_impacts(trade_ds):
 
     from agrifoodpy.impact.model import fbs_impacts
 
     # Basic test
-    items = ["Beef", "Apples"]
-    years = [2020, 2021]
-
-    fbs = xr.Dataset(
-        data_vars=dict(
-            imports=(["Year", "Item"], [[10, 20], [30, 40]]),
-            exports=(["Year", "Item"], [[5, 10], [15, 20]]),
-            production=(["Year", "Item"], [[50, 60], [70, 80]])
-            ),
-
-    coords=dict(Item=("Item", items), Year=("Year", years))
-    )
+    fbs = trade_ds
+    items = fbs.Item.values
+    years = fbs.Year.values
 
     impact = xr.DataArray([100, 0.5], dims=("Item"), coords={"Item": items})
 
@@ -25,9 +16,9 @@ def test_fbs_impacts():
 
     truth = xr.Dataset(
         data_vars=dict(
-            imports=(["Year", "Item"], [[1000, 10], [3000, 20]]),
-            exports=(["Year", "Item"], [[500, 5], [1500, 10]]),
-            production=(["Year", "Item"], [[5000, 30], [7000, 40]])
+            imports=(("Year", "Item"), [[1000, 10], [3000, 20]]),
+            exports=(("Year", "Item"), [[500, 5], [1500, 10]]),
+            production=(("Year", "Item"), [[5000, 30], [7000, 40]])
             ),
         coords=dict(Item=("Item", items), Year=("Year", years))
     )
@@ -44,9 +35,9 @@ def test_fbs_impacts():
 
     truth = xr.Dataset(
         data_vars=dict(
-            imports=(["Year", "Item"], [[1e9, 1e7], [3.3e9, 2.2e7]]),
-            exports=(["Year", "Item"], [[5e8, 5e6], [1.65e9, 1.1e7]]),
-            production=(["Year", "Item"], [[5e9, 3e7], [7.7e9, 4.4e7]])
+            imports=(("Year", "Item"), [[1e9, 1e7], [3.3e9, 2.2e7]]),
+            exports=(("Year", "Item"), [[5e8, 5e6], [1.65e9, 1.1e7]]),
+            production=(("Year", "Item"), [[5e9, 3e7], [7.7e9, 4.4e7]])
             ),
         coords=dict(Item=("Item", items),
                     Year=("Year", years))
@@ -62,15 +53,38 @@ def test_fbs_impacts():
 
     truth = xr.Dataset(
         data_vars=dict(
-            imports=(["Year"], [1.01e3, 3.02e3]),
-            exports=(["Year"], [5.05e2, 1.51e3]),
-            production=(["Year"], [5.03e3, 7.04e3])
+            imports=(("Year",), [1.01e3, 3.02e3]),
+            exports=(("Year",), [5.05e2, 1.51e3]),
+            production=(("Year",), [5.03e3, 7.04e3])
             ),
         coords=dict(Year=("Year", years))
         )
         
     assert result.equals(truth)
 
+    # Test summing over all dimensions with population and missing values
+    fbs_nan = fbs.where(fbs.Item != items[0])
+    result = fbs_impacts(fbs_nan, impact, population=population,
+                         sum_dims=["Item", "Year"])
+
+    truth = (fbs_nan * impact * population).sum(dim=["Item", "Year"])
+
+    xr.testing.assert_allclose(result, truth)
+
+    # Test summing over a dimension missing from some variables
+    fbs_mixed = fbs.assign(stock=fbs["production"].isel(Year=0, drop=True))
+    result = fbs_impacts(fbs_mixed, impact, sum_dims="Year")
+    truth = (fbs_mixed * impact).sum(dim="Year")
+
+    xr.testing.assert_allclose(result, truth)
+
+    # Test with a Dataset of impacts
+    impact_ds = xr.Dataset({"production": impact, "imports": 2*impact})
+    result = fbs_impacts(fbs, impact_ds, sum_dims=sum_dims)
+    truth = (fbs * impact_ds).sum(dim=sum_dims)
+
+    xr.testing.assert_allclose(result, truth)
+
 def test_fair_interface():
 
     from agrifoodpy.impact.model import fair_co2_only
@@ -118,3 +132,19 @@ def test_fair_interface():
     xr.testing.assert_allclose(T, T_truth)
     xr.testing.assert_allclose(C, C_truth)
     xr.testing.assert_allclose(F, F_truth)
+
+    # Test with a batch of emission scenarios, run at once
+    emissions_batch = xr.concat([emissions, 2*emissions],
+                                dim=xr.DataArray(["base", "double"],
+                                                 dims="Scenario"))
+
+    T_batch, C_batch, F_batch = fair_co2_only(emissions=emissions_batch)
+
+    assert T_batch.dims == ("timebounds", "Scenario")
+    xr.testing.assert_allclose(T_batch.sel(Scenario="base", drop=True),
+                               T_truth)
+    xr.testing.assert_allclose(C_batch.sel(Scenario="base", drop=True),
+                               C_truth)
+    xr.testing.assert_allclose(F_batch.sel(Scenario="base", drop=True),
+                               F_truth)
+    assert (T_batch.sel(Scenario="double") > T_truth).values[1:].all()
@@ -3,10 +3,95 @@
 
 import numpy as np
 import xarray as xr
-import matplotlib
-import matplotlib.pyplot as plt
-from matplotlib import colors as mcolors
-import matplotlib.patches as mpatches
+
+# Number of pixels above which maps are decimated to the axes resolution
+# before plotting
+_PLOT_MAX_SIZE = 2_000_000
+
+# Largest value range of an integer map for which category positions are
+# looked up in a dense table rather than searched for
+_LUT_MAX_SIZE = 2**16
+
+def _category_index(arr, values):
+    """Position of each element of an array within a list of category values,
+    or -1 where the element is not one of the values, including nan. Repeated
+    values map to their first position.
+    """
+    arr = np.asarray(arr)
+    values = np.atleast_1d(values)
+
+    if values.size == 0 or arr.size == 0:
+        return np.full(arr.shape, -1, dtype=np.intp)
+
+    # Integer maps with a bounded range use a dense lookup table, with a
+    # single indexed load per pixel
+    if arr.dtype.kind in "iu" and values.dtype.kind in "iuf":
+        low, high = int(arr.min()), int(arr.max())
+        if high - low < _LUT_MAX_SIZE:
+            in_range = (values >= low) & (values <= high) & \
+                (values == np.floor(values))
+            codes, first = np.unique(values[in_range].astype(np.intp),
+                                     return_index=True)
+            lut = np.full(high - low + 1, -1, dtype=np.intp)
+            lut[codes - low] = np.nonzero(in_range)[0][first]
+            return lut[np.subtract(arr, low, dtype=np.intp)]
+
+    # A stable sort keeps repeated values in order, so the search finds the
+    # first of them
+    order = np.argsort(values, kind="stable")
+    sorted_values = values[order]
+
+    pos = np.searchsorted(sorted_values, arr).clip(max=values.size - 1)
+    found = sorted_values[pos] == arr
+
+    return np.where(found, order[pos], -1)
+
+def _unique_values(arr):
+    """Sorted unique values of an array, as np.unique. Integer arrays with a
+    bounded range are counted in a single pass instead of being sorted, and
+    dask arrays are reduced block by block without loading the full map.
+    """
+    if isinstance(arr, xr.DataArray):
+        arr = arr.data
+
+    if not isinstance(arr, np.ndarray):
+        import dask.array as da
+        return np.unique(da.unique(arr).compute())
+
+    if arr.dtype.kind in "iu" and arr.size > 0:
+        low, high = int(arr.min()), int(arr.max())
+        if high - low < _LUT_MAX_SIZE:
+            counts = np.bincount(np.subtract(arr, low, dtype=np.intp).ravel())
+            return (np.nonzero(counts)[0] + low).astype(arr.dtype)
+
+    return np.unique(arr)
+
+def _category_lookup(map, values):
+    """Category positions of each pixel of a map, shifted by one so that zero
+    marks pixels outside the categories. Evaluated lazily for dask backed
+    maps.
+    """
+    index = xr.apply_ufunc(_category_index, map, kwargs={"values": values},
+                           dask="parallelized", output_dtypes=[np.intp])
+
+    return index + 1
+
+def _dominant_index(arr):
+    """Position of the largest value along the last axis, ignoring nan, or -1
+    where all values are nan.
+    """
+    isnan = np.isnan(arr)
+    index = np.where(isnan, -np.inf, arr).argmax(axis=-1)
+
+    return np.where(isnan.all(axis=-1), -1, index)
+
+def _bincount(arr, minlength):
+    """np.bincount, dispatching to dask for dask arrays"""
+    if isinstance(arr, np.ndarray):
+        return np.bincount(arr, minlength=minlength)
+
+    import dask.array as da
+    return da.bincount(arr, minlength=minlength)
 
 @xr.register_dataarray_accessor("land")
 class LandDataArray:
@@ -57,6 +142,11 @@ class LandDataArray:
         ax : matplotlib axes instance
         """
 
+        # Plotting modules are only loaded when a map is plotted
+        import matplotlib.pyplot as plt
+        from matplotlib import colors as mcolors
+        import matplotlib.patches as mpatches
+
         map = self._obj
 
         if ax is None:
@@ -69,14 +159,16 @@ class LandDataArray:
                 labels = map[extra_coords[0]].values
             map = self.dominant_class(class_coord=class_coord)
         else:
-            labels = np.unique(map.values)
+            labels = _unique_values(map.values)
 
         if colors is None:
-            colors = [f"C{i}" for i in np.arange(len(labels))]
+            colors = [f"C{i}" for i in range(len(labels))]
 
-        # Create a colour map
+        # Create a colour map, parsing all colours at once. Bounds sit
+        # halfway between consecutive class positions
+        colors = mcolors.to_rgba_array(colors)
         cmap = mcolors.ListedColormap(colors)
-        bounds = np.linspace(-0.5, len(colors), len(colors) + 1)
+        bounds = np.arange(-0.5, len(colors) + 0.5)
         norm = mcolors.BoundaryNorm(bounds, cmap.N)
 
         # Get plot ranges
@@ -88,12 +180,22 @@ class LandDataArray:
         xmin, xmax = map.x.values[[0, -1]]
         ymin, ymax = map.y.values[[0, -1]]
 
+        # Decimate maps much larger than the axes to about one pixel per
+        # display pixel. Striding picks existing pixels, so class values are
+        # preserved, and the extent is computed from the full map above
+        if map.size > _PLOT_MAX_SIZE:
+            bbox = ax.get_window_extent()
+            target = (max(1, int(bbox.height)), max(1, int(bbox.width)))
+            steps = [max(1, n // t) for n, t in zip(map.shape, target)]
+            map = map.isel({dim: slice(None, None, step)
+                            for dim, step in zip(map.dims, steps)})
+
         ax.imshow(map, interpolation="none", origin="lower",
                   extent=[xmin-dx_low, xmax+dx_high, ymin-dy_low, ymax+dy_high],
                   cmap=cmap, norm=norm)
         
-        patches = [mpatches.Patch(color=colors[i],
-                                  label=labels[i]) for i in np.arange(len(labels))]
+        patches = [mpatches.Patch(color=color, label=label)
+                   for color, label in zip(colors, labels)]
         
         ax.legend(handles=patches, loc="best")
         
@@ -123,21 +225,26 @@ class LandDataArray:
         """
 
         map = self._obj
-        ones = xr.ones_like(map)
 
         if dim is None:
             dim = map.name
 
         if values is None:
-            values = np.unique(map)
+            values = _unique_values(map)
         else:
             values = np.array(values)
 
         # Prevent nan values from being counted
         nan_indices = np.isnan(values)
         values = values[~nan_indices]
-        area = [ones.where(map==value).sum() for value in values]
-        
+
+        # Tally all categories in a single pass over the map, dropping the
+        # count of pixels outside the categories. Repeated values are counted
+        # once and expanded back to their positions
+        unique, inverse = np.unique(values, return_inverse=True)
+        index = _category_lookup(map, unique).data.ravel()
+        area = _bincount(index, unique.size + 1)[1:][inverse]
+
         area_arr = xr.DataArray(area, dims=dim, coords={dim:values})
 
         return area_arr
@@ -186,12 +293,12 @@ class LandDataArray:
             dim_right = map_right.name
 
         if values_left is None:
-            values_left = np.unique(map_left)
+            values_left = _unique_values(map_left)
         else:
             values_left = np.array(values_left)
 
         if values_right is None:
-            values_right = np.unique(map_right)
+            values_right = _unique_values(map_right)
         else:
             values_right = np.array(values_right)
 
@@ -202,8 +309,22 @@ class LandDataArray:
         values_left = values_left[~nan_indices_left]
         values_right = values_right[~nan_indices_right]
 
-        ones = xr.ones_like(map_left)
-        area = [[ones.where(map_left==vl).where(map_right==vr).sum().values for vr in values_right] for vl in values_left]
+        # Joint histogram of the category pairs, in a single pass over the
+        # maps. Row and column zero count pixels outside the categories, and
+        # repeated values are counted once and expanded back as in
+        # area_by_type
+        unique_left, inverse_left = np.unique(values_left, return_inverse=True)
+        unique_right, inverse_right = np.unique(values_right,
+                                                return_inverse=True)
+
+        n_left, n_right = unique_left.size + 1, unique_right.size + 1
+        index_left = _category_lookup(map_left, unique_left)
+        index_right = _category_lookup(map_right, unique_right)
+
+        pairs = (index_left * n_right + index_right).data.ravel()
+        area = _bincount(pairs, n_left*n_right).reshape(n_left,
+                                                        n_right)[1:, 1:]
+        area = area[inverse_left][:, inverse_right]
 
         area_arr = xr.DataArray(area, dims=[dim_left, dim_right], coords={dim_left:values_left, dim_right:values_right})
 
@@ -236,22 +357,22 @@ class LandDataArray:
 
         # Check input values
         if values_left is None:
-            values_left = np.unique(map_left)
+            values_left = _unique_values(map_left)
         else:
             values_left = np.array(values_left)
 
         if values_right is None:
-            values_right = np.unique(map_right)
+            values_right = _unique_values(map_right)
         else:
             values_right = np.array(values_right)
 
         # Align maps to the left so they have the same dimensions
         map_left, map_right = xr.align(map_left, map_right, join=join)
 
-        shape = map_left.shape
-
-        left_match = np.in1d(map_left, values_left).reshape(shape)
-        right_match = np.in1d(map_right, values_right).reshape(shape)
+        # Membership masks from the category lookup, which uses a dense table
+        # for integer maps and keeps the input shape
+        left_match = _category_lookup(map_left, values_left) > 0
+        right_match = _category_lookup(map_right, values_right) > 0
 
         category_match = map_left.where(left_match).where(right_match)
 
@@ -280,10 +401,23 @@ class LandDataArray:
         if class_coord is None:
             class_coord = [dim for dim in map.dims if dim not in ["x", "y"]][0]
 
+        labels = map[class_coord].values
         if return_index:
-            len_class = len(map[class_coord].values)
-            map = map.assign_coords({class_coord:np.arange(len_class)})
+            labels = np.arange(len(labels))
+
+        # Positional argmax along the class dimension, gathered from the class
+        # labels. The appended nan is picked for pixels without any values
+        if labels.dtype.kind in "iufb":
+            table = np.append(labels.astype(float), np.nan)
+        else:
+            table = np.append(labels.astype(object), np.nan)
+
+        index = xr.apply_ufunc(_dominant_index, map,
+                               input_core_dims=[[class_coord]],
+                               dask="parallelized", output_dtypes=[np.intp],
+                               dask_gufunc_kwargs={"allow_rechunk": True})
 
-        map = map.idxmax(dim=class_coord, skipna=True)
+        map = xr.apply_ufunc(table.take, index, dask="parallelized",
+                             output_dtypes=[table.dtype])
 
-        return map
\ No newline at end of file
+        return map.rename(class_coord)
\ No newline at end of file
@@ -3,7 +3,7 @@
 """
 
 import numpy as np
-from agrifoodpy.land.land import LandDataArray
+import xarray as xr
 
 def land_sequestration(land_da, use_id, fraction, max_seq, years=None,
                        growth_timescale=10, growth="linear", ha_per_pixel=1):
@@ -45,22 +45,20 @@ def land_sequestration(land_da, use_id, fraction, max_seq, years=None,
         DataArray with the per year sequestration
     """
     
-    if np.isscalar(use_id):
-        use_id = np.array(use_id)
+    use_id = np.atleast_1d(use_id)
 
     # If single scalar value, use the same for all categories
     if np.isscalar(fraction):
         fraction = np.ones_like(use_id)*fraction
     else:
-        fraction = np.array(fraction)
+        fraction = np.asarray(fraction)
 
-    if not (fraction >= 0).all() and (fraction <= 1).all():
+    if not ((fraction >= 0) & (fraction <= 1)).all():
         raise ValueError("Input fraction values must be between 0 and 1")
             
-    pixel_count_category = land_da.land.area_by_type(values=use_id)
-    
-    # area in hectares
-    area_category = pixel_count_category * ha_per_pixel
+    # Converted pixel total, weighting the category counts by their fractions
+    pixel_count_category = land_da.land.area_by_type(values=use_id).data
+    total_pixels = xr.DataArray((pixel_count_category * fraction).sum())
 
     if growth == "linear":
         from agrifoodpy.utils.scaling import linear_scale as growth_shape
@@ -70,21 +68,19 @@ def land_sequestration(land_da, use_id, fraction, max_seq, years=None,
         raise ValueError("Growth must be one of 'linear' or 'logistic'")
     
     if years is not None:
-        # single scalar value
+        # A single scalar value is the length of a year range starting at zero
         if np.isscalar(years):
-            scale = growth_shape(0, 0, growth_timescale, years, 0, 1)
-        # year range
-        else:
-            y0 = np.max((0, np.min(years)))
-            y1 = np.max((0, np.min(years)))
-            y2 = growth_timescale + y1
-            y3 = np.max(years)
-            scale = growth_shape(y0, y1, y2, y3, 0, 1)
+            years = np.arange(years + 1)
+
+        # Growth starts on the first year and is evaluated once over the
+        # whole range
+        y_start = max(0, np.min(years))
+        scale = growth_shape(y_start, y_start, y_start + growth_timescale,
+                             np.max(years), 0, 1)
     else:
         scale = 1
 
-    # agroforestry    
-    area = area_category * fraction
-    total_seq = area.sum() * scale * max_seq
+    # agroforestry, with area in hectares
+    total_seq = total_pixels * ha_per_pixel * scale * max_seq
 
     return total_seq
\ No newline at end of file
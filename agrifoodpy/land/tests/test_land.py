@@ -1,8 +1,11 @@
 import numpy as np
 import xarray as xr
-from agrifoodpy.land.land import LandDataArray
+from agrifoodpy.land.land import LandDataArray, _category_index
 import pytest
 import matplotlib.pyplot as plt
+from matplotlib import colors as mcolors
+
+_RNG = np.random.default_rng(0)
 
 def test_area_by_type():
     
@@ -46,6 +49,50 @@ def test_area_by_type():
     assert(np.array_equal(expected_result_nan, result_nan))
     assert(list(result_nan.coords) == ["land_nan"])
 
+    # Test area by type on an integer coded map
+    land_int = LandDataArray(da.astype(np.int16))
+    result_int = land_int.area_by_type(values=[2, 0, 5])
+
+    assert(np.array_equal(np.array([4,4,0]), result_int))
+
+    # Signed integer maps whose range crosses zero
+    da_int8 = xr.DataArray(np.array([[-100, 0], [5, 100]], dtype=np.int8),
+                           coords={"x": [0, 1], "y": [0, 1]}, name="land")
+    result_int8 = LandDataArray(da_int8).area_by_type(values=[-100,100,0,5])
+
+    assert(np.array_equal(np.array([1,1,1,1]), result_int8))
+
+    # Repeated values are each given the full area of their category, on
+    # integer and float maps
+    da_repeat = xr.DataArray(np.array([[1, 1], [2, 0]]),
+                             coords={"x": [0, 1], "y": [0, 1]}, name="land")
+    for da_dtype in [da_repeat, da_repeat.astype(float)]:
+        result_repeat = LandDataArray(da_dtype).area_by_type(values=[1,1,2])
+        assert(np.array_equal(np.array([2,2,1]), result_repeat))
+        assert(np.array_equal(result_repeat["land"], [1,1,2]))
+
+    result_int8_all = LandDataArray(da_int8).area_by_type()
+    assert(np.array_equal(result_int8_all["land"], [-100, 0, 5, 100]))
+    assert(np.array_equal(result_int8_all, [1, 1, 1, 1]))
+
+    match_int8 = LandDataArray(da_int8).category_match(da_int8,
+                                                       values_left=[100],
+                                                       values_right=[100])
+    assert(match_int8.sel(x=1, y=1) == 100)
+    assert(match_int8.isnull().sum() == 3)
+
+def test_category_index():
+
+    # Integer and float maps agree, with repeated values mapped to their first
+    # position and values outside the list to -1
+    data = np.array([[1, 1], [2, 0]])
+    values = [2, 1, 1, 2]
+    expected = np.array([[1, 1], [0, -1]])
+
+    assert(np.array_equal(_category_index(data, values), expected))
+    assert(np.array_equal(_category_index(data.astype(float), values),
+                          expected))
+
 def test_area_overlap():
 
     data_left = np.tile((np.arange(3, dtype=float)), (4,1))
@@ -114,7 +161,56 @@ def test_area_overlap():
     result_nan = land_left_nan.area_overlap(da_right_nan)
 
     assert(np.array_equal(expected_results_nan, result_nan))
+
+    # Repeated values are each given the full overlap, on integer and float
+    # maps
+    for da_dtype in [da_left, da_left.astype(int)]:
+        result_repeat = LandDataArray(da_dtype).area_overlap(
+            da_right, values_left=[1,1], values_right=[2,0,2])
+        assert(np.array_equal(np.ones((2,3)), result_repeat))
+        assert(np.array_equal(result_repeat[name_right], [2,0,2]))
     
+def test_area_chunked():
+
+    pytest.importorskip("dask")
+
+    data_left = np.tile((np.arange(3, dtype=float)), (4,1))
+    data_right = np.repeat((np.arange(4, dtype=float)), 3).reshape((4,3))
+    data_left[-1, -1] = np.nan
+
+    da_left = xr.DataArray(data=data_left, name="land_left",
+                    coords={"x": [0, 1, 2, 3], "y": [0, 1, 2]})
+    da_right = xr.DataArray(data=data_right, name="land_right",
+                    coords={"x": [0, 1, 2, 3], "y": [0, 1, 2]})
+
+    chunked_left = da_left.chunk({"x": 2})
+    chunked_right = da_right.chunk({"x": 2})
+
+    # Areas stay lazy and match the in-memory results once computed
+    area = LandDataArray(chunked_left).area_by_type(values=[0, 1, 2])
+    expected = LandDataArray(da_left).area_by_type(values=[0, 1, 2])
+    assert area.chunks
+    xr.testing.assert_equal(area.compute(), expected)
+
+    # Categories found on the chunked map match the in-memory ones
+    area_all = LandDataArray(chunked_left).area_by_type()
+    xr.testing.assert_equal(area_all.compute(),
+                            LandDataArray(da_left).area_by_type())
+
+    overlap = LandDataArray(chunked_left).area_overlap(
+        chunked_right, values_left=[0, 1, 2], values_right=[0, 1, 2, 3])
+    assert overlap.chunks
+    xr.testing.assert_equal(overlap.compute(),
+                            LandDataArray(da_left).area_overlap(
+                                da_right, values_left=[0, 1, 2],
+                                values_right=[0, 1, 2, 3]))
+
+    classes = xr.concat([chunked_left, chunked_right], dim="class")
+    dominant = LandDataArray(classes).dominant_class()
+    assert dominant.chunks
+    xr.testing.assert_equal(dominant.compute(),
+                            LandDataArray(classes.compute()).dominant_class())
+
 def test_category_match():
 
     data_left = np.tile((np.arange(3, dtype=float)), (4,1))
@@ -161,9 +257,15 @@ def test_category_match():
     result_non_matching = land_left.category_match(da_right, values_left=4)
     assert np.all(result_non_matching.isnull())
 
+    # Integer maps give the same matches
+    result_int = land_left.category_match(da_right.astype(int),
+                                          values_left=[0,1],
+                                          values_right=[1,2])
+    assert result_int.equals(result_multivar)
+
 def test_plot():
     
-    data = np.random.rand(4, 5)
+    data = _RNG.random((4, 5))
     da = xr.DataArray(data, dims=['x', 'y'])
     land = LandDataArray(da)
     
@@ -171,14 +273,36 @@ def test_plot():
     ax = land.plot()
     assert isinstance(ax, plt.Axes)
 
+    # Class positions map to the given colours, one legend entry per class
+    da_class = xr.DataArray(np.arange(6).reshape((2, 3)) % 3, dims=['x', 'y'])
+    ax = LandDataArray(da_class).plot(colors=["red", "green", "blue"])
+    image = ax.get_images()[0]
+    assert np.array_equal(image.norm([0, 1, 2]), [0, 1, 2])
+    handles = ax.get_legend().legend_handles
+    assert [h.get_label() for h in handles] == ["0", "1", "2"]
+    assert np.allclose(handles[1].get_facecolor(), mcolors.to_rgba("green"))
+    plt.close(ax.figure)
+
+    # Large maps are decimated to the axes resolution, keeping their extent
+    data_large = np.repeat(np.arange(3), 1000*1000).reshape((3000, 1000))
+    da_large = xr.DataArray(data_large, dims=['x', 'y'],
+                            coords={"x": np.arange(3000),
+                                    "y": np.arange(1000)})
+    ax = LandDataArray(da_large).plot()
+    image = ax.get_images()[0]
+    assert image.get_array().size < data_large.size
+    assert np.array_equal(np.unique(image.get_array()), [0, 1, 2])
+    assert np.allclose(image.get_extent(), [-0.5, 2999.5, -0.5, 999.5])
+    plt.close(ax.figure)
+
 def test_dominant_class():
     classes = ["a", "b", "c"]
     coords = {"x": [0, 1, 2, 3], "y": [0, 1, 2], "class": classes}
     coords_index = {"x": [0, 1, 2, 3], "y": [0, 1, 2]}
     
-    data = np.random.rand(len(coords["x"]),
-                          len(coords["y"]),
-                          len(coords["class"]))
+    data = _RNG.random((len(coords["x"]),
+                        len(coords["y"]),
+                        len(coords["class"])))
     
     da = xr.DataArray(data, coords=coords)
     land = LandDataArray(da)
@@ -200,4 +324,11 @@ def test_dominant_class():
     result_return_index_truth = xr.DataArray(np.argmax(data, axis=2),
                                              coords=coords_index)
 
-    assert result_return_index.equals(result_return_index_truth)
\ No newline at end of file
+    assert result_return_index.equals(result_return_index_truth)
+
+    # Pixels without any class values are set to nan
+    da_nan = da.where((da.x != 0) | (da.y != 0))
+    result_nan = LandDataArray(da_nan).dominant_class()
+    assert result_nan.equals(da_nan.idxmax(dim="class"))
+    assert np.isnan(LandDataArray(da_nan).dominant_class(
+        return_index=True).sel(x=0, y=0))
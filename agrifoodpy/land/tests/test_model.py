@@ -1,5 +1,6 @@
 import numpy as np
 import xarray as xr
+import pytest
 from agrifoodpy.land.model import land_sequestration
 
 def test_land_sequestration():
@@ -25,6 +26,20 @@ def test_land_sequestration():
 
     xr.testing.assert_equal(result, truth)
 
+    # test with repeated categories, on integer and float maps
+    for lda_dtype in [lda, lda.astype(float)]:
+        result = land_sequestration(lda_dtype, [1,1], [0.2, 0.6], 1.)
+        truth = xr.DataArray(data=1.6)
+
+        xr.testing.assert_allclose(result, truth)
+
+    # test fraction values outside of the [0, 1] range
+    with pytest.raises(ValueError):
+        land_sequestration(lda, [0,1], [0.5, 1.5], 10)
+
+    with pytest.raises(ValueError):
+        land_sequestration(lda, [0,1], [-0.5, 1.5], 10)
+
     # test with years value
     result = land_sequestration(lda, 0, 0.5, 10, years=10, growth_timescale=10)
     truth = xr.DataArray(data=np.arange(11), coords={"Year":np.arange(11)})
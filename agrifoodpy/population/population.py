@@ -60,8 +60,9 @@ def population(years, regions, quantities, datasets=None, long_format=True):
         ndims = 3
 
     # make sure the long format has the right number of dimensions
-    while len(quantities.shape) < ndims:
-        quantities = np.expand_dims(quantities, axis=0)
+    if quantities.ndim < ndims:
+        quantities = quantities.reshape((1,) * (ndims - quantities.ndim)
+                                        + quantities.shape)
 
     # If no dataset names are given, then create generic ones, one for each
     # dataset
@@ -76,7 +77,7 @@ def population(years, regions, quantities, datasets=None, long_format=True):
     if long_format:
         # Create a datasets, one at a time
         for id, dataset in enumerate(datasets):
-            values = np.zeros(size)*np.nan
+            values = np.full(size, np.nan)
             values[tuple(ii)] = quantities[id]
             data[dataset] = (coords, values)
 
@@ -17,10 +17,15 @@ LONG_DESC_TYPE = "text/markdown"
 INSTALL_REQUIRES = [
       'numpy',
       'pandas',
-      'xarray',
+      'xarray>=2024.1.0',
       'matplotlib',
+      'scipy',
 ]
 
+EXTRAS_REQUIRE = {
+      'test': ['pytest', 'pytest-xdist', 'dask'],
+}
+
 setup(name=PACKAGE_NAME,
       version=VERSION,
       description=DESCRIPTION,
@@ -31,5 +36,6 @@ setup(name=PACKAGE_NAME,
       author_email=AUTHOR_EMAIL,
       url=URL,
       install_requires=INSTALL_REQUIRES,
+      extras_require=EXTRAS_REQUIRE,
       packages=find_packages()
       )